@@ -0,0 +1,81 @@
+"""
+Gesture Mouse Core
+Typed per-frame math for GestureMouse, written so mypyc can compile it:
+
+    pip install mypy
+    mypyc _gesture_mouse_core.py
+
+Without the compiled extension this module is simply imported as Python
+"""
+from typing import Final, Tuple
+
+# Actions returned by pinch_transition
+ACTION_NONE: Final = 0
+ACTION_START_PINCH: Final = 1
+ACTION_START_DRAG: Final = 2
+ACTION_STOP_DRAG: Final = 3
+ACTION_CLICK: Final = 4
+
+
+def map_and_smooth(index_x: int, index_y: int, margin: int, sx: float, sy: float,
+                   screen_w: int, screen_h: int, prev_x: float, prev_y: float,
+                   inv_smoothing: float) -> Tuple[float, float]:
+    """
+    Map a camera point to the screen, clamp it, and apply one smoothing step
+    
+    Args:
+        index_x, index_y: Fingertip position in camera coordinates
+        margin: Movement zone margin in camera pixels
+        sx, sy: Camera-to-screen scale factors for the movement zone
+        screen_w, screen_h: Screen dimensions
+        prev_x, prev_y: Previous smoothed cursor position
+        inv_smoothing: 1 / smoothing factor
+        
+    Returns:
+        New smoothed (x, y) cursor position as floats
+    """
+    target_x = (index_x - margin) * sx
+    target_y = (index_y - margin) * sy
+    if target_x < 0.0:
+        target_x = 0.0
+    elif target_x >= screen_w:
+        target_x = screen_w - 1.0
+    if target_y < 0.0:
+        target_y = 0.0
+    elif target_y >= screen_h:
+        target_y = screen_h - 1.0
+    
+    return (prev_x + (target_x - prev_x) * inv_smoothing,
+            prev_y + (target_y - prev_y) * inv_smoothing)
+
+
+def pinch_transition(is_pinching: bool, was_pinching: bool, is_dragging: bool,
+                     start_ns: int, now_ns: int, drag_ns: int) -> int:
+    """
+    Decide the click/drag action for one frame's pinch state
+    
+    Args:
+        is_pinching: Whether the current frame shows a pinch
+        was_pinching: Whether a pinch was already in progress
+        is_dragging: Whether a drag is active
+        start_ns: Timestamp the current pinch started (ns)
+        now_ns: Timestamp of the frame (ns)
+        drag_ns: Hold time before a pinch becomes a drag (ns)
+        
+    Returns:
+        One of the ACTION_* constants
+    """
+    if is_pinching:
+        if not was_pinching:
+            # Pinch just started
+            return ACTION_START_PINCH
+        if now_ns - start_ns >= drag_ns and not is_dragging:
+            # Start dragging after threshold time
+            return ACTION_START_DRAG
+        return ACTION_NONE
+    
+    if was_pinching:
+        # Pinch ended: end drag, or any release outside a drag = click
+        return ACTION_STOP_DRAG if is_dragging else ACTION_CLICK
+    
+    return ACTION_NONE
@@ -3,17 +3,54 @@ Hand Gesture Mouse Control
 Uses hand tracking to control mouse cursor and perform clicks
 """
 import cv2
+import math
 import numpy as np
 import pyautogui
+import queue
+import sys
+import threading
 import time
-from hand_tracker import HandDetector
-from collections import deque
+import _gesture_mouse_core as core
+from camera import open_camera
+from hand_tracker import HandDetector, MODEL_PATH
+from mouse_backend import create_backend
+from terminal_keys import TerminalKeys
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 # Configure PyAutoGUI with SAFETY FEATURES
 pyautogui.FAILSAFE = True  # Move mouse to top-left corner for EMERGENCY STOP
 pyautogui.PAUSE = 0  # Remove pause between commands for smooth movement
 
 
+@njit(cache=True, fastmath=True)
+def _pinch_kernel(lm, threshold):
+    """
+    Fused pinch detection on the landmark array (index tip 8, thumb tip 4)
+    
+    Args:
+        lm: int32 landmark array with [id, x, y] rows
+        threshold: Pinch distance threshold
+        
+    Returns:
+        Tuple (is_pinching, distance, index_x, index_y, thumb_x, thumb_y)
+    """
+    ix = lm[8, 1]
+    iy = lm[8, 2]
+    tx = lm[4, 1]
+    ty = lm[4, 2]
+    dx = ix - tx
+    dy = iy - ty
+    distance = math.sqrt(dx * dx + dy * dy)
+    return distance < threshold, distance, ix, iy, tx, ty
+
+
 class GestureMouse:
     """
     Hand gesture mouse controller
@@ -21,17 +58,32 @@ class GestureMouse:
     
     def __init__(self):
         """Initialize gesture mouse controller"""
-        self.detector = HandDetector(max_hands=1, detection_confidence=0.7, tracking_confidence=0.7)
+        # GPU HandLandmarker in LIVE_STREAM mode when the model is present
+        self.detector = HandDetector(max_hands=1, detection_confidence=0.7, tracking_confidence=0.7,
+                                     model_path=MODEL_PATH, live_stream=True)
         
         # Screen dimensions
         self.screen_width, self.screen_height = pyautogui.size()
         
+        # Native cursor API resolved once (PyAutoGUI dispatch is too slow per frame)
+        self.mouse = create_backend()
+        
+        # Last position actually sent to the OS; moves smaller than the dead
+        # zone (|dx| + |dy|, in pixels) are skipped
+        self._last_moved_x, self._last_moved_y = -1, -1
+        self.move_dead_zone = 2
+        # While moves are being skipped, query the real cursor for the
+        # fail-safe corner only every Nth call
+        self.failsafe_interval = 10
+        self._skipped_moves = 0
+        
         # Camera frame dimensions (will be set when video starts)
         self.frame_width = 640
         self.frame_height = 480
         
         # Smoothing parameters
         self.smoothing = 5  # Reduced from 7 for more responsive movement
+        self._inv_smoothing = 1.0 / self.smoothing
         self.prev_x, self.prev_y = 0, 0
         
         # Click detection
@@ -47,12 +99,62 @@ class GestureMouse:
         self.pinch_start_time = 0
         self.drag_threshold_time = 3.0  # Time to hold pinch before drag starts (3 seconds)
         
+        # Timing thresholds in integer nanoseconds (timestamps come from time.monotonic_ns)
+        self._dbl_ns = int(self.double_click_time * 1e9)
+        self._cooldown_ns = int(self.click_cooldown * 1e9)
+        self._drag_ns = int(self.drag_threshold_time * 1e9)
+        
         # Movement zone (ignore edges for stability) - OPTIMIZED FOR SENSITIVITY
         self.margin = 150  # Increased for higher sensitivity (smaller zone = more cursor movement)
+        self.update_zone()
+        
+        # Visual feedback - pinch history as a fixed-size ring buffer
+        self.pinch_history = np.zeros(10, dtype=np.uint8)
+        self._pinch_idx = 0
+        
+        # Overlay layer re-rendered every Nth frame (putText is expensive)
+        self.overlay_interval = 3
+        self._frame_counter = 0
+        self._overlay = None
+        self._overlay_mask = None
+        
+        # FPS averaged over fps_interval frames; label sprite redrawn only when the value changes
+        self.fps_interval = 15
+        self._fps_frames = 0
+        self._fps_t0 = time.monotonic_ns()
+        self._fps_value = 0
+        self._fps_sprite = None
+        self._fps_sprite_y = 0
+        
+        # Invariant zone/instruction pixels, rebuilt only when frame size changes
+        self._static_overlay = None
+        
+        # Capture -> inference -> display pipeline; single-slot queues so the
+        # consumer only ever sees the freshest frame
+        self._frames = queue.Queue(maxsize=1)
+        self._display_frames = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        # HighGUI must stay on the main thread on macOS
+        self._display_inline = sys.platform == "darwin"
+        # Console 'Q' poll for the main loop when HighGUI runs off-thread
+        self.keys = TerminalKeys()
         
-        # Visual feedback
-        self.pinch_history = deque(maxlen=10)
+        # Warm up the pinch kernel so JIT compilation doesn't stall the first frame
+        _pinch_kernel(np.zeros((21, 3), dtype=np.int32), self.pinch_threshold)
         
+    def update_zone(self):
+        """
+        Precompute camera-to-screen scale factors for the movement zone
+        
+        Must be called whenever frame dimensions or margin change
+        """
+        self._zone_x2 = self.frame_width - self.margin
+        self._zone_y2 = self.frame_height - self.margin
+        self._zone_w = self.frame_width - 2 * self.margin
+        self._zone_h = self.frame_height - 2 * self.margin
+        self._sx = self.screen_width / self._zone_w
+        self._sy = self.screen_height / self._zone_h
+    
     def get_distance(self, p1, p2):
         """
         Calculate Euclidean distance between two points
@@ -63,7 +165,9 @@ class GestureMouse:
         Returns:
             Distance between points
         """
-        return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+        dx = p1[0] - p2[0]
+        dy = p1[1] - p2[1]
+        return math.sqrt(dx * dx + dy * dy)
     
     def smooth_coordinates(self, x, y):
         """
@@ -75,8 +179,8 @@ class GestureMouse:
         Returns:
             Smoothed (x, y) coordinates
         """
-        smooth_x = self.prev_x + (x - self.prev_x) / self.smoothing
-        smooth_y = self.prev_y + (y - self.prev_y) / self.smoothing
+        smooth_x = self.prev_x + (x - self.prev_x) * self._inv_smoothing
+        smooth_y = self.prev_y + (y - self.prev_y) * self._inv_smoothing
         
         self.prev_x, self.prev_y = smooth_x, smooth_y
         
@@ -92,23 +196,28 @@ class GestureMouse:
         Returns:
             Screen coordinates (x, y)
         """
-        # Define movement zone (excluding margins)
-        zone_x1, zone_y1 = self.margin, self.margin
-        zone_x2 = self.frame_width - self.margin
-        zone_y2 = self.frame_height - self.margin
+        # Clamp to movement zone (excluding margins)
+        if x < self.margin:
+            x = self.margin
+        elif x > self._zone_x2:
+            x = self._zone_x2
+        if y < self.margin:
+            y = self.margin
+        elif y > self._zone_y2:
+            y = self._zone_y2
         
-        # Map to screen with inverted Y axis for natural movement
-        screen_x = np.interp(x, [zone_x1, zone_x2], [0, self.screen_width])
-        screen_y = np.interp(y, [zone_y1, zone_y2], [0, self.screen_height])
+        # Linear map to screen using precomputed scale factors
+        screen_x = int((x - self.margin) * self._sx)
+        screen_y = int((y - self.margin) * self._sy)
         
-        return int(screen_x), int(screen_y)
+        return screen_x, screen_y
     
     def detect_pinch(self, landmarks):
         """
         Detect pinch gesture (index finger + thumb touching)
         
         Args:
-            landmarks: List of hand landmarks
+            landmarks: int32 (21, 3) landmark array from HandDetector.find_position
             
         Returns:
             Tuple (is_pinching, distance)
@@ -116,37 +225,88 @@ class GestureMouse:
         if len(landmarks) == 0:
             return False, 0
         
-        # Get index fingertip (8) and thumb tip (4)
-        index_tip = (landmarks[8][1], landmarks[8][2])
-        thumb_tip = (landmarks[4][1], landmarks[4][2])
+        # Distance between index fingertip (8) and thumb tip (4)
+        is_pinching, distance = _pinch_kernel(landmarks, self.pinch_threshold)[:2]
         
-        # Calculate distance
-        distance = self.get_distance(index_tip, thumb_tip)
+        return bool(is_pinching), distance
+    
+    def move_cursor(self, x, y):
+        """
+        Move cursor through the native backend, keeping PyAutoGUI's fail-safe
         
-        # Check if pinching
-        is_pinching = distance < self.pinch_threshold
+        Sub-dead-zone moves (measured against the last position this process
+        set) are coalesced away without touching the OS; the fail-safe queries
+        the real cursor before every move, and every failsafe_interval skipped
+        calls so the emergency stop still works while the hand is still
         
-        return is_pinching, distance
+        Args:
+            x, y: Screen coordinates
+            
+        Raises:
+            pyautogui.FailSafeException: If the cursor is in the top-left corner
+        """
+        skip = abs(x - self._last_moved_x) + abs(y - self._last_moved_y) < self.move_dead_zone
+        if skip:
+            self._skipped_moves += 1
+            if self._skipped_moves < self.failsafe_interval:
+                return
+        self._skipped_moves = 0
+        
+        if pyautogui.FAILSAFE and self.mouse.position() == (0, 0):
+            raise pyautogui.FailSafeException("Fail-safe triggered from mouse moving to top-left corner")
+        
+        if skip:
+            return
+        
+        self.mouse.move(x, y)
+        self._last_moved_x, self._last_moved_y = x, y
+    
+    def update_pinch_state(self, is_pinching, current_time):
+        """
+        Advance the click/drag state machine with one frame's pinch state
+        
+        Args:
+            is_pinching: Whether the current frame shows a pinch
+            current_time: Timestamp of the frame (time.monotonic_ns)
+        """
+        # Store pinch state
+        self.pinch_history[self._pinch_idx] = is_pinching
+        self._pinch_idx = (self._pinch_idx + 1) % len(self.pinch_history)
+        
+        action = core.pinch_transition(bool(is_pinching), self.is_pinching, self.is_dragging,
+                                       self.pinch_start_time, current_time, self._drag_ns)
+        
+        if action == core.ACTION_START_PINCH:
+            self.is_pinching = True
+            self.pinch_start_time = current_time
+        elif action == core.ACTION_START_DRAG:
+            self.start_drag()
+        elif action == core.ACTION_STOP_DRAG:
+            self.stop_drag()
+            self.is_pinching = False
+        elif action == core.ACTION_CLICK:
+            self.handle_click()
+            self.is_pinching = False
     
     def handle_click(self):
         """
         Handle click detection and double-click
         """
-        current_time = time.time()
+        current_time = time.monotonic_ns()
         
         # Check if enough time has passed since last click
-        if current_time - self.last_pinch_time < self.click_cooldown:
+        if current_time - self.last_pinch_time < self._cooldown_ns:
             return
         
         # Check for double click
-        if current_time - self.last_pinch_time < self.double_click_time:
+        if current_time - self.last_pinch_time < self._dbl_ns:
             # Double click detected
-            pyautogui.doubleClick()
+            self.mouse.double_click()
             self.pinch_count = 0
             print("Double Click!")
         else:
             # Single click
-            pyautogui.click()
+            self.mouse.click()
             self.pinch_count = 1
             print("Click!")
         
@@ -157,7 +317,7 @@ class GestureMouse:
         Start dragging operation
         """
         if not self.is_dragging:
-            pyautogui.mouseDown()
+            self.mouse.mouse_down()
             self.is_dragging = True
             print("Drag Started!")
     
@@ -166,17 +326,240 @@ class GestureMouse:
         Stop dragging operation
         """
         if self.is_dragging:
-            pyautogui.mouseUp()
+            self.mouse.mouse_up()
             self.is_dragging = False
             print("Drag Ended!")
     
+    def draw_static_overlay(self, img):
+        """
+        Draw overlay elements that never change for a given frame size
+        
+        Args:
+            img: Image to draw on
+        """
+        # Draw movement zone with instructions
+        cv2.rectangle(img, (self.margin, self.margin), 
+                     (self.frame_width - self.margin, self.frame_height - self.margin),
+                     (255, 255, 0), 2)
+        cv2.putText(img, "Active Zone", (self.margin + 10, self.margin + 25), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+        
+        # Instructions at bottom
+        cv2.putText(img, "Green = Index | Blue = Thumb | Yellow = High Sensitivity Zone", 
+                   (10, self.frame_height - 70), cv2.FONT_HERSHEY_SIMPLEX, 
+                   0.5, (255, 255, 255), 1)
+        cv2.putText(img, "Quick Pinch = Click | Double Pinch = Double Click", 
+                   (10, self.frame_height - 45), cv2.FONT_HERSHEY_SIMPLEX, 
+                   0.5, (255, 255, 255), 1)
+        cv2.putText(img, "Pinch = Click | Hold 3 sec = DRAG | Q to Quit", 
+                   (10, self.frame_height - 20), cv2.FONT_HERSHEY_SIMPLEX, 
+                   0.5, (255, 255, 255), 1)
+    
+    def build_static_overlay(self, shape):
+        """
+        Pre-render the static overlay sprite
+        
+        Args:
+            shape: Frame shape (h, w, c)
+        """
+        self._static_overlay = np.zeros(shape, dtype=np.uint8)
+        self.draw_static_overlay(self._static_overlay)
+    
+    def update_fps(self, now):
+        """
+        Count a frame and refresh the averaged FPS every fps_interval frames
+        
+        Args:
+            now: Current time (time.monotonic_ns)
+        """
+        self._fps_frames += 1
+        if self._fps_frames < self.fps_interval:
+            return
+        
+        fps = int(self._fps_frames * 1e9 / (now - self._fps_t0))
+        self._fps_frames = 0
+        self._fps_t0 = now
+        if fps != self._fps_value:
+            self._fps_value = fps
+            self._fps_sprite = None
+    
+    def draw_fps(self, img):
+        """
+        Blit the FPS label, rasterizing it only after the value changed
+        
+        Args:
+            img: Image to draw on (black background overlay layer)
+        """
+        if self._fps_sprite is None:
+            (w, h), baseline = cv2.getTextSize("FPS: 9999", cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+            self._fps_sprite = np.zeros((h + baseline + 4, w + 4, 3), dtype=np.uint8)
+            cv2.putText(self._fps_sprite, f"FPS: {self._fps_value}", (0, h + 2),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            self._fps_sprite_y = 30 - h - 2  # Keeps the text baseline at y=30
+        
+        sh, sw = self._fps_sprite.shape[:2]
+        y = self._fps_sprite_y
+        img[y:y + sh, 10:10 + sw] = self._fps_sprite
+    
+    def draw_overlay(self, img, hand, hand_info):
+        """
+        Draw visual feedback and info panel
+        
+        Args:
+            img: Image to draw on
+            hand: Tuple (index_x, index_y, thumb_x, thumb_y, is_pinching,
+                  pinch_distance, timestamp_ns) or None if no hand detected
+            hand_info: Hand detection information
+        """
+        if hand is not None:
+            index_x, index_y, thumb_x, thumb_y, is_pinching, pinch_distance, current_time = hand
+            
+            # Draw thumb tip
+            cv2.circle(img, (thumb_x, thumb_y), 15, (255, 0, 0), cv2.FILLED)
+            cv2.putText(img, "THUMB", (thumb_x + 20, thumb_y), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+            
+            # Draw line between thumb and index
+            line_color = (0, 255, 255) if is_pinching else (255, 0, 0)
+            cv2.line(img, (index_x, index_y), (thumb_x, thumb_y), 
+                    line_color, 3)
+            
+            # Display pinch distance
+            mid_x = (index_x + thumb_x) // 2
+            mid_y = (index_y + thumb_y) // 2
+            cv2.putText(img, f"{int(pinch_distance)}px", (mid_x, mid_y),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            
+            # Pinch indicator with timer
+            if self.is_dragging:
+                cv2.putText(img, "DRAGGING!", (50, 100),
+                           cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 0, 255), 3)
+                cv2.circle(img, (50, 150), 20, (255, 0, 255), cv2.FILLED)
+            elif is_pinching:
+                pinch_duration = current_time - self.pinch_start_time
+                remaining = max(0, self._drag_ns - pinch_duration) / 1e9
+                cv2.putText(img, f"PINCH: {remaining:.1f}s", (50, 100),
+                           cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 165, 255), 3)
+                cv2.circle(img, (50, 150), 20, (0, 165, 255), cv2.FILLED)
+                # Progress bar for drag threshold
+                progress = min(1.0, pinch_duration / self._drag_ns)
+                bar_width = int(300 * progress)
+                cv2.rectangle(img, (50, 170), (350, 190), (100, 100, 100), -1)
+                cv2.rectangle(img, (50, 170), (50 + bar_width, 190), (0, 255, 0), -1)
+        
+        # Display info panel
+        self.draw_fps(img)
+        cv2.putText(img, f"Tracking: {'ON' if hand_info.detected else 'OFF'}", 
+                   (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 
+                   (0, 255, 0) if hand_info.detected else (0, 0, 255), 2)
+        cv2.putText(img, f"Screen: {self.screen_width}x{self.screen_height}", 
+                   (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    
+    def render_overlay(self, shape, hand, hand_info):
+        """
+        Re-rasterize the dynamic overlay on top of the static sprite
+        
+        Args:
+            shape: Frame shape (h, w, c)
+            hand: Hand state tuple or None (see draw_overlay)
+            hand_info: Hand detection information
+        """
+        if self._static_overlay is None or self._static_overlay.shape != shape:
+            self.build_static_overlay(shape)
+            self._overlay = np.empty(shape, dtype=np.uint8)
+        
+        # Start from the static sprite so its glyphs are never re-rasterized
+        np.copyto(self._overlay, self._static_overlay)
+        self.draw_overlay(self._overlay, hand, hand_info)
+        
+        # Any non-black pixel is overlay content
+        self._overlay_mask = cv2.cvtColor(self._overlay, cv2.COLOR_BGR2GRAY)
+    
+    def _put_latest(self, q, item):
+        """
+        Put item on a bounded queue, dropping the oldest entry when full
+        
+        Args:
+            q: Target queue
+            item: Item to enqueue
+        """
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _capture_loop(self, cap):
+        """
+        Producer thread: read and mirror camera frames
+        
+        Frames are grabbed continuously to keep the driver buffer drained, but
+        only decoded when the consumer has taken the previous one
+        
+        Args:
+            cap: Opened cv2.VideoCapture
+        """
+        # Decode target reused every frame; the mirrored copy made by cv2.flip
+        # is the frame handed to the other threads
+        raw = None
+        while not self._stop.is_set():
+            success = cap.grab()
+            if success and not self._frames.empty():
+                # Inference is behind - drop this frame undecoded
+                continue
+            if success:
+                success, raw = cap.retrieve(raw)
+            if not success:
+                print("Warning: Failed to read frame from camera")
+                self._stop.set()
+                break
+            
+            # Flip image for mirror effect (drawing later needs a contiguous
+            # copy, so a negative-stride view can't replace this)
+            img = cv2.flip(raw, 1)
+            self._put_latest(self._frames, img)
+    
+    def _show(self, img):
+        """
+        Show a frame and handle the quit key
+        
+        Args:
+            img: Frame to display
+        """
+        cv2.imshow("Hand Gesture Mouse Control", img)
+        
+        # Exit on 'Q' key
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q') or key == ord('Q'):
+            print("\n[SAFE EXIT] Quitting gesture control...")
+            self._stop.set()
+    
+    def _display_loop(self):
+        """
+        Display thread: render annotated frames off the inference path
+        """
+        while not self._stop.is_set():
+            try:
+                img = self._display_frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._show(img)
+        
+        # The window belongs to this thread; destroy it before exiting
+        cv2.destroyAllWindows()
+    
     def run(self):
         """
         Main loop for gesture mouse control
+        
+        Capture and display run on their own threads; this thread runs
+        hand tracking and owns all cursor/click calls
         """
-        cap = cv2.VideoCapture(0)
-        cap.set(3, self.frame_width)
-        cap.set(4, self.frame_height)
+        cap = open_camera(0, self.frame_width, self.frame_height)
         
         if not cap.isOpened():
             print("ERROR: Could not open camera!")
@@ -185,6 +568,9 @@ class GestureMouse:
         print("\n" + "="*60)
         print("  HAND GESTURE MOUSE CONTROL - STARTED")
         print("="*60)
+        print(f"\nHand tracking backend: {self.detector.backend}")
+        if self.detector.backend_error:
+            print(f"HandLandmarker unavailable ({self.detector.backend_error})")
         print("\nGesture Controls:")
         print("  - Move INDEX FINGER to control cursor")
         print("  - PINCH once (Index + Thumb) for LEFT CLICK")
@@ -196,32 +582,47 @@ class GestureMouse:
         print("  - Your regular mouse works normally alongside gestures")
         print("="*60 + "\n")
         
-        prev_time = 0
+        # Frame size is fixed once the camera is streaming - read it once
+        success, img = cap.read()
+        if not success:
+            print("ERROR: Could not read from camera!")
+            cap.release()
+            return
+        self.frame_height, self.frame_width = img.shape[:2]
+        self.update_zone()
+        
+        self._stop.clear()
+        self._fps_frames, self._fps_t0 = 0, time.monotonic_ns()
+        threads = [threading.Thread(target=self._capture_loop, args=(cap,), daemon=True)]
+        if not self._display_inline:
+            threads.append(threading.Thread(target=self._display_loop, daemon=True))
+        for thread in threads:
+            thread.start()
+        if not self._display_inline:
+            self.keys.start()
         
         try:
-            while True:
-                success, img = cap.read()
-                if not success:
-                    print("Warning: Failed to read frame from camera")
+            while not self._stop.is_set():
+                # Non-blocking console poll; the display thread's waitKey(1)
+                # handles 'Q' in the window
+                key = self.keys.read()
+                if key == 'q' or key == 'Q':
+                    print("\n[SAFE EXIT] Quitting gesture control...")
                     break
                 
-                # Flip image for mirror effect
-                img = cv2.flip(img, 1)
+                try:
+                    img = self._frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
                 
-                # Update frame dimensions
-                self.frame_height, self.frame_width = img.shape[:2]
+                # Find hands and get hand info
+                hand_info = self.detector.process_frame(img)
+                landmarks = hand_info.landmarks
                 
-                # Find hands
-                img = self.detector.find_hands(img, draw=True)
-                landmarks = self.detector.find_position(img, draw=False)
-                
-                # Get hand info
-                hand_info = self.detector.get_hand_info()
-                
-                if hand_info['detected'] and len(landmarks) > 0:
+                hand = None
+                if hand_info.detected and len(landmarks) > 0:
                     # Get index fingertip position (landmark 8)
-                    index_tip = landmarks[8]
-                    index_x, index_y = index_tip[1], index_tip[2]
+                    index_x, index_y = int(landmarks[8, 1]), int(landmarks[8, 2])
                     
                     # Draw circle on index fingertip
                     cv2.circle(img, (index_x, index_y), 15, (0, 255, 0), cv2.FILLED)
@@ -231,128 +632,48 @@ class GestureMouse:
                     # Check for pinch gesture
                     is_pinching, pinch_distance = self.detect_pinch(landmarks)
                     
-                    # Store pinch state
-                    self.pinch_history.append(is_pinching)
-                    
                     # Get current time for drag detection
-                    current_time = time.time()
+                    current_time = time.monotonic_ns()
                     
                     # Handle pinch detection with drag support
-                    if is_pinching and not self.is_pinching:
-                        # Pinch just started
-                        self.is_pinching = True
-                        self.pinch_start_time = current_time
-                    elif is_pinching and self.is_pinching:
-                        # Pinch is being held
-                        pinch_duration = current_time - self.pinch_start_time
-                        
-                        if pinch_duration >= self.drag_threshold_time and not self.is_dragging:
-                            # Start dragging after threshold time
-                            self.start_drag()
-                    elif not is_pinching and self.is_pinching:
-                        # Pinch ended
-                        pinch_duration = current_time - self.pinch_start_time
-                        
-                        if self.is_dragging:
-                            # End drag if we were dragging
-                            self.stop_drag()
-                        else:
-                            # Any pinch release (not during drag) = click
-                            self.handle_click()
-                        
-                        self.is_pinching = False
+                    self.update_pinch_state(is_pinching, current_time)
                     
                     # Move mouse cursor
-                    # Map coordinates to screen
-                    screen_x, screen_y = self.map_to_screen(index_x, index_y)
-                    
-                    # Smooth movement
-                    smooth_x, smooth_y = self.smooth_coordinates(screen_x, screen_y)
+                    # Map to screen (clamped to screen bounds) and smooth in one
+                    # typed core call (compiled when built with mypyc)
+                    px, py = core.map_and_smooth(index_x, index_y, self.margin, self._sx, self._sy,
+                                                 self.screen_width, self.screen_height,
+                                                 self.prev_x, self.prev_y, self._inv_smoothing)
+                    self.prev_x, self.prev_y = px, py
+                    smooth_x, smooth_y = int(px), int(py)
                     
                     # Move cursor (works for both normal movement and dragging)
                     try:
-                        pyautogui.moveTo(smooth_x, smooth_y)
+                        self.move_cursor(smooth_x, smooth_y)
                     except pyautogui.FailSafeException:
                         print("\n[EMERGENCY STOP] Mouse moved to corner - Exiting safely...")
                         if self.is_dragging:
                             self.stop_drag()
                         break
                     
-                    # Visual feedback
-                    # Draw thumb tip
-                    thumb_tip = landmarks[4]
-                    cv2.circle(img, (thumb_tip[1], thumb_tip[2]), 15, (255, 0, 0), cv2.FILLED)
-                    cv2.putText(img, "THUMB", (thumb_tip[1] + 20, thumb_tip[2]), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-                    
-                    # Draw line between thumb and index
-                    line_color = (0, 255, 255) if is_pinching else (255, 0, 0)
-                    cv2.line(img, (index_x, index_y), (thumb_tip[1], thumb_tip[2]), 
-                            line_color, 3)
-                    
-                    # Display pinch distance
-                    mid_x = (index_x + thumb_tip[1]) // 2
-                    mid_y = (index_y + thumb_tip[2]) // 2
-                    cv2.putText(img, f"{int(pinch_distance)}px", (mid_x, mid_y),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                    
-                    # Pinch indicator with timer
-                    if self.is_dragging:
-                        cv2.putText(img, "DRAGGING!", (50, 100),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 0, 255), 3)
-                        cv2.circle(img, (50, 150), 20, (255, 0, 255), cv2.FILLED)
-                    elif is_pinching:
-                        pinch_duration = current_time - self.pinch_start_time
-                        remaining = max(0, self.drag_threshold_time - pinch_duration)
-                        cv2.putText(img, f"PINCH: {remaining:.1f}s", (50, 100),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 165, 255), 3)
-                        cv2.circle(img, (50, 150), 20, (0, 165, 255), cv2.FILLED)
-                        # Progress bar for drag threshold
-                        progress = min(1.0, pinch_duration / self.drag_threshold_time)
-                        bar_width = int(300 * progress)
-                        cv2.rectangle(img, (50, 170), (350, 190), (100, 100, 100), -1)
-                        cv2.rectangle(img, (50, 170), (50 + bar_width, 190), (0, 255, 0), -1)
-                
-                # Draw movement zone with instructions
-                cv2.rectangle(img, (self.margin, self.margin), 
-                             (self.frame_width - self.margin, self.frame_height - self.margin),
-                             (255, 255, 0), 2)
-                cv2.putText(img, "Active Zone", (self.margin + 10, self.margin + 25), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+                    # Hand state for the overlay layer
+                    hand = (index_x, index_y, int(landmarks[4, 1]), int(landmarks[4, 2]),
+                            is_pinching, pinch_distance, current_time)
                 
                 # Calculate FPS
-                current_time = time.time()
-                fps = 1 / (current_time - prev_time) if prev_time > 0 else 0
-                prev_time = current_time
-                
-                # Display info panel
-                cv2.putText(img, f"FPS: {int(fps)}", (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(img, f"Tracking: {'ON' if hand_info['detected'] else 'OFF'}", 
-                           (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 
-                           (0, 255, 0) if hand_info['detected'] else (0, 0, 255), 2)
-                cv2.putText(img, f"Screen: {self.screen_width}x{self.screen_height}", 
-                           (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                self.update_fps(time.monotonic_ns())
                 
-                # Instructions at bottom
-                cv2.putText(img, "Green = Index | Blue = Thumb | Yellow = High Sensitivity Zone", 
-                           (10, self.frame_height - 70), cv2.FONT_HERSHEY_SIMPLEX, 
-                           0.5, (255, 255, 255), 1)
-                cv2.putText(img, "Quick Pinch = Click | Double Pinch = Double Click", 
-                           (10, self.frame_height - 45), cv2.FONT_HERSHEY_SIMPLEX, 
-                           0.5, (255, 255, 255), 1)
-                cv2.putText(img, "Pinch = Click | Hold 3 sec = DRAG | Q to Quit", 
-                           (10, self.frame_height - 20), cv2.FONT_HERSHEY_SIMPLEX, 
-                           0.5, (255, 255, 255), 1)
+                # Re-rasterize overlays every Nth frame, composite the cached layer every frame
+                if self._frame_counter % self.overlay_interval == 0 or self._overlay is None:
+                    self.render_overlay(img.shape, hand, hand_info)
+                cv2.copyTo(self._overlay, self._overlay_mask, img)
+                self._frame_counter += 1
                 
-                # Show image
-                cv2.imshow("Hand Gesture Mouse Control", img)
-                
-                # Exit on 'Q' key
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q') or key == ord('Q'):
-                    print("\n[SAFE EXIT] Quitting gesture control...")
-                    break
+                # Show image (display thread owns imshow/waitKey)
+                if self._display_inline:
+                    self._show(img)
+                else:
+                    self._put_latest(self._display_frames, img)
         
         except KeyboardInterrupt:
             print("\n[KEYBOARD INTERRUPT] Exiting safely...")
@@ -363,8 +684,14 @@ class GestureMouse:
             # Ensure drag is stopped if active
             if self.is_dragging:
                 self.stop_drag()
+            self._stop.set()
+            self.keys.stop()
+            for thread in threads:
+                thread.join(timeout=1.0)
             cap.release()
-            cv2.destroyAllWindows()
+            self.detector.close()
+            if self._display_inline:
+                cv2.destroyAllWindows()
             print("\n" + "="*60)
             print("  Hand Gesture Mouse Control STOPPED")
             print("  Your regular mouse is now the only active input")
@@ -2,17 +2,45 @@
 Hand Tracking Module
 Uses MediaPipe's pre-trained models for hand detection and tracking
 """
+import os
+import threading
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
 
+# Tasks API HandLandmarker model (downloaded separately, see README);
+# detectors fall back to mp.solutions.hands when it is absent. Set
+# HAND_LANDMARKER_MODEL to use another bundle, e.g. an INT8-quantized one
+MODEL_PATH = os.environ.get(
+    "HAND_LANDMARKER_MODEL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "hand_landmarker.task")
+)
+
+
+class HandInfo:
+    """
+    Per-frame hand tracking data, updated in place by HandDetector.get_hand_info
+    """
+    __slots__ = ('detected', 'confidence', 'landmarks', 'fingers_up', 'center', 'fingertips')
+    
+    def __init__(self):
+        """Initialize as 'no hand detected'"""
+        self.detected = False
+        self.confidence = 0.0
+        self.landmarks = None
+        self.fingers_up = None
+        self.center = None
+        self.fingertips = None
+
 
 class HandDetector:
     """
     Hand detector class that uses MediaPipe for real-time hand tracking
     """
     
-    def __init__(self, mode=False, max_hands=2, detection_confidence=0.5, tracking_confidence=0.5):
+    def __init__(self, mode=False, max_hands=2, detection_confidence=0.5, tracking_confidence=0.5,
+                 model_path=None, use_gpu=True, live_stream=False, use_opencl=False):
         """
         Initialize hand detector with MediaPipe
         
@@ -21,27 +49,174 @@ class HandDetector:
             max_hands: Maximum number of hands to detect
             detection_confidence: Minimum detection confidence threshold
             tracking_confidence: Minimum tracking confidence threshold
+            model_path: Path to a hand_landmarker.task model; enables the Tasks API
+                        HandLandmarker (falls back to mp.solutions.hands if missing)
+            use_gpu: Run the HandLandmarker on the GPU delegate when available
+            live_stream: Run the HandLandmarker asynchronously (LIVE_STREAM mode);
+                         results then lag the submitted frame slightly
+            use_opencl: Downscale and color-convert large frames through OpenCV's
+                        T-API when an OpenCL device is available
         """
         self.mode = mode
         self.max_hands = max_hands
         self.detection_confidence = detection_confidence
         self.tracking_confidence = tracking_confidence
         
-        # Initialize MediaPipe hands module (pre-trained model)
+        # Per-hand landmark sequences (normalized x, y) and scores from the last frame
+        self.hand_landmarks = []
+        self.hand_scores = []
+        
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=self.mode,
-            max_num_hands=self.max_hands,
-            min_detection_confidence=self.detection_confidence,
-            min_tracking_confidence=self.tracking_confidence
-        )
+        self.landmarker = None
+        self.live_stream = False
+        # Inference backend actually in use, e.g. "HandLandmarker (GPU)", and
+        # why HandLandmarker could not be created when it fell back
+        self.backend = "mp.solutions.hands (CPU)"
+        self.backend_error = None
+        if model_path and os.path.exists(model_path):
+            try:
+                self._create_landmarker(model_path, use_gpu, live_stream)
+            except Exception as e:
+                self.backend_error = str(e)
+        
+        if self.landmarker is None:
+            # Initialize MediaPipe hands module (pre-trained model)
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=self.mode,
+                max_num_hands=self.max_hands,
+                min_detection_confidence=self.detection_confidence,
+                min_tracking_confidence=self.tracking_confidence
+            )
         self.mp_draw = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
         # Hand landmark indices
         self.finger_tips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky tips
         self.finger_pips = [2, 6, 10, 14, 18]  # PIP joints for finger detection
+        self._tip_idx = np.array(self.finger_tips)
+        self._pip_idx = np.array(self.finger_pips)
+        
+        # Score of the tracked hand (0 when no hand detected)
+        self.confidence = 0.0
+        
+        # Landmark buffer reused across frames: one [id, x, y] row per landmark
+        self._lm_buf = np.empty((21, 3), dtype=np.int32)
+        self._lm_buf[:, 0] = np.arange(21)
+        self.landmark_list = self._lm_buf[:0]
+        # (x, y) columns of the same buffer
+        self.landmark_array = self._lm_buf[:0, 1:]
+        
+        # RGB conversion target, allocated on the first frame and reused
+        self._rgb_buf = None
+        
+        # Returned by get_hand_info and refreshed every call
+        self.hand_info = HandInfo()
+        
+        # Wider frames are downscaled to this width before inference (the
+        # model runs at 256x256 and landmarks come back normalized)
+        self.inference_width = 640
+        self._small_buf = None
+        # Opt-in: run that resize + color conversion through OpenCV's T-API,
+        # writing into persistent device buffers
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        self._umat_size = None
+        self._small_umat = None
+        self._rgb_umat = None
+        
+        # Idle throttling (video only): after idle_frames empty frames, only run
+        # inference every idle_stride-th frame until a hand shows up again
+        self.idle_frames = 10
+        self.idle_stride = 3
+        self.frame_idx = 0
+        self._miss_count = 0
+        self._skip_stride = 1
+        
+    def _create_landmarker(self, model_path, use_gpu, live_stream):
+        """
+        Create a Tasks API HandLandmarker, preferring the GPU delegate
+        
+        Args:
+            model_path: Path to the hand_landmarker.task model
+            use_gpu: Try the GPU delegate before falling back to CPU
+            live_stream: Use LIVE_STREAM (async callback) instead of VIDEO mode
+        """
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
         
+        self._vision = vision
+        if self.mode:
+            running_mode = vision.RunningMode.IMAGE
+        elif live_stream:
+            running_mode = vision.RunningMode.LIVE_STREAM
+        else:
+            running_mode = vision.RunningMode.VIDEO
+        
+        callback = {}
+        if running_mode == vision.RunningMode.LIVE_STREAM:
+            self._result_lock = threading.Lock()
+            self._latest_result = None
+            callback['result_callback'] = self._on_result
+        
+        delegates = [mp_tasks.BaseOptions.Delegate.GPU] if use_gpu else []
+        delegates.append(mp_tasks.BaseOptions.Delegate.CPU)
+        
+        for delegate in delegates:
+            options = vision.HandLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(model_asset_path=model_path, delegate=delegate),
+                running_mode=running_mode,
+                num_hands=self.max_hands,
+                min_hand_detection_confidence=self.detection_confidence,
+                min_hand_presence_confidence=self.tracking_confidence,
+                min_tracking_confidence=self.tracking_confidence,
+                **callback
+            )
+            try:
+                self.landmarker = vision.HandLandmarker.create_from_options(options)
+                self.backend = f"HandLandmarker ({delegate.name})"
+                break
+            except Exception:
+                # GPU delegate is not supported on every platform
+                if delegate == delegates[-1]:
+                    raise
+        
+        self._running_mode = running_mode
+        self.live_stream = running_mode == vision.RunningMode.LIVE_STREAM
+        self._last_timestamp_ms = -1
+    
+    def _on_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback, runs on MediaPipe's thread"""
+        with self._result_lock:
+            self._latest_result = result
+    
+    def _detect_tasks(self, img_rgb):
+        """
+        Run the Tasks API HandLandmarker on an RGB frame
+        
+        Args:
+            img_rgb: Input image (RGB format)
+        """
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+        vision = self._vision
+        
+        if self._running_mode == vision.RunningMode.IMAGE:
+            self.results = self.landmarker.detect(mp_image)
+        else:
+            # Timestamps must be strictly increasing
+            timestamp_ms = max(time.monotonic_ns() // 1_000_000, self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            if self._running_mode == vision.RunningMode.VIDEO:
+                self.results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+            else:
+                self.landmarker.detect_async(mp_image, timestamp_ms)
+                with self._result_lock:
+                    self.results = self._latest_result
+        
+        if self.results is None:
+            self.hand_landmarks, self.hand_scores = [], []
+        else:
+            self.hand_landmarks = self.results.hand_landmarks
+            self.hand_scores = [categories[0].score for categories in self.results.handedness]
+    
     def find_hands(self, img, draw=True):
         """
         Find hands in the image
@@ -53,25 +228,128 @@ class HandDetector:
         Returns:
             Image with drawings (if draw=True)
         """
-        # Convert BGR to RGB for MediaPipe
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
+        self.frame_idx += 1
+        if not self.mode and self.frame_idx % self._skip_stride:
+            # No hand lately - keep the previous (empty) result
+            return img
+        
+        img_rgb = self._prepare_rgb(img)
+        
+        if self.landmarker is not None:
+            self._detect_tasks(img_rgb)
+        else:
+            self.results = self.hands.process(img_rgb)
+            hands = self.results.multi_hand_landmarks or []
+            self.hand_landmarks = [hand.landmark for hand in hands]
+            self.hand_scores = [c.classification[0].score for c in self.results.multi_handedness or []]
+        
+        # Idle throttling only applies to video; static images are unrelated
+        if not self.mode:
+            if self.hand_landmarks:
+                self._miss_count = 0
+                self._skip_stride = 1
+            else:
+                self._miss_count += 1
+                if self._miss_count > self.idle_frames:
+                    self._skip_stride = self.idle_stride
         
         # Draw hand landmarks if hands detected
-        if self.results.multi_hand_landmarks:
-            for hand_landmarks in self.results.multi_hand_landmarks:
-                if draw:
-                    # Draw landmarks with connections
-                    self.mp_draw.draw_landmarks(
-                        img,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                        self.mp_drawing_styles.get_default_hand_connections_style()
-                    )
+        if draw:
+            for hand_landmarks in self._drawable_landmarks():
+                # Draw landmarks with connections
+                self.mp_draw.draw_landmarks(
+                    img,
+                    hand_landmarks,
+                    self.mp_hands.HAND_CONNECTIONS,
+                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
+                    self.mp_drawing_styles.get_default_hand_connections_style()
+                )
         
         return img
     
+    def _prepare_rgb(self, img):
+        """
+        Downscale a frame to the inference size and convert it to RGB
+        
+        Args:
+            img: Input image (BGR format)
+            
+        Returns:
+            RGB image for MediaPipe
+        """
+        # Downscale large frames first so the color conversion touches fewer pixels
+        h, w = img.shape[:2]
+        size = None
+        if w > self.inference_width:
+            size = (self.inference_width, h * self.inference_width // w)
+        
+        if self.use_opencl and size is not None:
+            # The frame is uploaded once by resize, both steps write into reused
+            # device buffers, and only the small RGB frame is downloaded
+            if self._umat_size != size:
+                self._small_umat = cv2.UMat(size[1], size[0], cv2.CV_8UC3)
+                self._rgb_umat = cv2.UMat(size[1], size[0], cv2.CV_8UC3)
+                self._umat_size = size
+            cv2.resize(img, size, dst=self._small_umat, interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(self._small_umat, cv2.COLOR_BGR2RGB, dst=self._rgb_umat)
+            return self._rgb_umat.get()
+        
+        src = img
+        if size is not None:
+            if self._small_buf is None or self._small_buf.shape[1::-1] != size:
+                self._small_buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            src = cv2.resize(img, size, dst=self._small_buf, interpolation=cv2.INTER_LINEAR)
+        
+        # Convert BGR to RGB for MediaPipe into the reused buffer
+        # (reallocated only when the frame size changes)
+        if self._rgb_buf is None or self._rgb_buf.shape != src.shape:
+            self._rgb_buf = np.empty(src.shape, dtype=np.uint8)
+        return cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+    
+    def _drawable_landmarks(self):
+        """
+        Landmarks of the last frame as protobuf lists for mp drawing_utils
+        
+        Returns:
+            List of NormalizedLandmarkList, one per detected hand
+        """
+        if self.landmarker is None:
+            return self.results.multi_hand_landmarks or []
+        
+        from mediapipe.framework.formats import landmark_pb2
+        
+        protos = []
+        for hand in self.hand_landmarks:
+            proto = landmark_pb2.NormalizedLandmarkList()
+            proto.landmark.extend(
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand
+            )
+            protos.append(proto)
+        return protos
+    
+    def close(self):
+        """Release the MediaPipe graph"""
+        if self.landmarker is not None:
+            self.landmarker.close()
+        else:
+            self.hands.close()
+    
+    def process_frame(self, img, draw_landmarks=True, draw_tips=False):
+        """
+        Track the first hand in one frame: detect, locate landmarks and summarize
+        
+        Args:
+            img: Input image (BGR format), drawn on in place
+            draw_landmarks: Whether to draw the hand skeleton
+            draw_tips: Whether to draw circles on the fingertips
+            
+        Returns:
+            HandInfo for the frame (the same object every call)
+        """
+        self.find_hands(img, draw=draw_landmarks)
+        self.find_position(img, draw=draw_tips)
+        return self.get_hand_info()
+    
     def find_position(self, img, hand_no=0, draw=True):
         """
         Find positions of hand landmarks
@@ -82,25 +360,35 @@ class HandDetector:
             draw: Whether to draw circles on fingertips
             
         Returns:
-            List of landmark positions [id, x, y]
-        """
-        self.landmark_list = []
-        
-        if self.results.multi_hand_landmarks:
-            if hand_no < len(self.results.multi_hand_landmarks):
-                hand = self.results.multi_hand_landmarks[hand_no]
-                
-                # Get image dimensions
-                h, w, c = img.shape
-                
-                # Extract each landmark position
-                for id, landmark in enumerate(hand.landmark):
-                    cx, cy = int(landmark.x * w), int(landmark.y * h)
-                    self.landmark_list.append([id, cx, cy])
-                    
-                    # Draw circles on fingertips
-                    if draw and id in self.finger_tips:
-                        cv2.circle(img, (cx, cy), 15, (255, 0, 255), cv2.FILLED)
+            int32 (21, 3) array of landmark positions, one [id, x, y] row per
+            landmark (empty if no hand). The buffer is reused by the next call;
+            self.landmark_array holds its (21, 2) [x, y] columns.
+        """
+        self.landmark_list = self._lm_buf[:0]
+        self.landmark_array = self._lm_buf[:0, 1:]
+        self.confidence = 0.0
+        
+        if hand_no < len(self.hand_landmarks):
+            hand = self.hand_landmarks[hand_no]
+            self.confidence = self.hand_scores[hand_no]
+            
+            # Get image dimensions
+            h, w, c = img.shape
+            
+            # Read all normalized landmarks in one bulk conversion, then scale
+            # to pixels in one pass; the cast truncates like int()
+            pts = np.array([(lm.x, lm.y) for lm in hand], dtype=np.float32)
+            pts *= (w, h)
+            pix = self._lm_buf[:, 1:]
+            np.copyto(pix, pts, casting='unsafe')
+            
+            # Draw circles on fingertips
+            if draw:
+                for cx, cy in pix[self.finger_tips].tolist():
+                    cv2.circle(img, (cx, cy), 15, (255, 0, 255), cv2.FILLED)
+            
+            self.landmark_list = self._lm_buf
+            self.landmark_array = pix
         
         return self.landmark_list
     
@@ -109,23 +397,20 @@ class HandDetector:
         Check which fingers are up
         
         Returns:
-            List of 5 values (0 or 1) for each finger [Thumb, Index, Middle, Ring, Pinky]
+            uint8 array of 5 values (0 or 1) for each finger [Thumb, Index, Middle, Ring, Pinky],
+            empty if no hand detected
         """
-        fingers = []
+        lm = self.landmark_array
+        if len(lm) == 0:
+            return np.zeros(0, dtype=np.uint8)
         
-        if len(self.landmark_list) != 0:
-            # Thumb (special case - check horizontal position)
-            if self.landmark_list[self.finger_tips[0]][1] > self.landmark_list[self.finger_tips[0] - 1][1]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
-            
-            # Other 4 fingers (check vertical position)
-            for id in range(1, 5):
-                if self.landmark_list[self.finger_tips[id]][2] < self.landmark_list[self.finger_pips[id]][2]:
-                    fingers.append(1)
-                else:
-                    fingers.append(0)
+        tips = lm[self._tip_idx]
+        pips = lm[self._pip_idx]
+        fingers = np.empty(5, dtype=np.uint8)
+        # Thumb (special case - check horizontal position)
+        fingers[0] = tips[0, 0] > lm[self.finger_tips[0] - 1, 0]
+        # Other 4 fingers (check vertical position)
+        fingers[1:] = tips[1:, 1] < pips[1:, 1]
         
         return fingers
     
@@ -137,10 +422,9 @@ class HandDetector:
             Tuple (x, y) of hand center or None if no hand detected
         """
         if len(self.landmark_list) != 0:
-            wrist = self.landmark_list[0]
-            middle_mcp = self.landmark_list[9]
-            center_x = (wrist[1] + middle_mcp[1]) // 2
-            center_y = (wrist[2] + middle_mcp[2]) // 2
+            lm = self.landmark_list
+            center_x = int(lm[0, 1] + lm[9, 1]) // 2  # Wrist + middle finger MCP
+            center_y = int(lm[0, 2] + lm[9, 2]) // 2
             return (center_x, center_y)
         return None
     
@@ -149,22 +433,16 @@ class HandDetector:
         Get comprehensive hand information
         
         Returns:
-            Dictionary with hand tracking data
-        """
-        info = {
-            'detected': len(self.landmark_list) > 0,
-            'landmarks': self.landmark_list,
-            'fingers_up': self.fingers_up() if len(self.landmark_list) > 0 else [],
-            'center': self.get_hand_center(),
-            'fingertips': []
-        }
-        
-        # Extract fingertip positions
-        if len(self.landmark_list) > 0:
-            for tip_id in self.finger_tips:
-                info['fingertips'].append({
-                    'id': tip_id,
-                    'position': (self.landmark_list[tip_id][1], self.landmark_list[tip_id][2])
-                })
+            HandInfo with hand tracking data (the same object every call);
+            fingertips is a (5, 2) [x, y] view of the landmark buffer
+        """
+        info = self.hand_info
+        info.detected = len(self.landmark_list) > 0
+        info.confidence = self.confidence
+        info.landmarks = self.landmark_list
+        info.fingers_up = self.fingers_up()
+        info.center = self.get_hand_center()
+        # Tips are landmarks 4, 8, 12, 16, 20
+        info.fingertips = self.landmark_array[4::4]
         
         return info
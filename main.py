@@ -4,9 +4,12 @@ Real-time hand tracking with finger detection using camera feed
 Uses pre-trained MediaPipe models for robust tracking
 """
 import cv2
+import queue
+import threading
 import time
 import numpy as np
-from hand_tracker import HandDetector
+from camera import open_camera
+from hand_tracker import HandDetector, MODEL_PATH
 
 
 class HandTrackingApp:
@@ -17,12 +20,47 @@ class HandTrackingApp:
     def __init__(self):
         """Initialize the application"""
         self.cap = None
-        self.detector = HandDetector(max_hands=2, detection_confidence=0.7, tracking_confidence=0.7)
-        self.trail_points = []  # Store trail points for movement visualization
+        # Tasks API HandLandmarker on the GPU delegate when the model is present;
+        # LIVE_STREAM mode submits frames asynchronously so the loop never waits
+        # on inference (landmarks may lag the displayed frame by one frame).
+        # 720p frames get downscaled before inference, so let OpenCL do it
+        self.detector = HandDetector(max_hands=2, detection_confidence=0.7, tracking_confidence=0.7,
+                                     model_path=MODEL_PATH, live_stream=True, use_opencl=True)
         self.max_trail_length = 30
+        # Ring buffer of trail points for movement visualization
+        self._trail = np.zeros((self.max_trail_length, 2), np.int32)
+        self._trail_len = 0
+        self._trail_head = 0
+        # Thickness of the segment ending at trail index i, and its color
+        # for a trail of n points in self._trail_colors[n][i] (computed once)
+        idx = np.arange(self.max_trail_length)
+        self._trail_thickness = (np.sqrt(self.max_trail_length / (idx + 1.0)) * 3).astype(np.int32).tolist()
+        self._trail_colors = [[]]
+        for n in range(1, self.max_trail_length + 1):
+            alpha = idx[:n] / n
+            colors = np.stack([255 * alpha, 100 * alpha, 255 * (1 - alpha)], axis=1).astype(np.int32)
+            self._trail_colors.append([tuple(c) for c in colors.tolist()])
+        # The gradient is drawn as this many polylines
+        self.trail_groups = 4
         self.tracking_active = False
         self.locked_hand_id = None
         
+        # Static instruction text, rasterized once
+        self._instr_img = self._build_instructions_layer()
+        
+        # Capture thread hands frames over a single slot (latest frame wins)
+        self._frames = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        self._grab_thread = None
+        
+        # Mirrored frame, drawn on and displayed; the detector keeps its own
+        # reused downscale and RGB buffers
+        self._flip_buf = None
+        
+        # Smoothed FPS (exponential moving average over perf_counter deltas)
+        self._fps = 0.0
+        self._prev_t = 0.0
+        
     def start_camera(self, camera_id=0):
         """
         Start the camera feed
@@ -30,17 +68,39 @@ class HandTrackingApp:
         Args:
             camera_id: Camera device ID (0 for default camera)
         """
-        self.cap = cv2.VideoCapture(camera_id)
-        self.cap.set(3, 1280)  # Width
-        self.cap.set(4, 720)   # Height
+        # Native backend, MJPG at 60 FPS and a 1-frame buffer so each read
+        # returns the freshest frame
+        self.cap = open_camera(camera_id, width=1280, height=720, fps=60)
         
         if not self.cap.isOpened():
             print(f"Error: Could not open camera {camera_id}")
             return False
         
         print(f"Camera {camera_id} opened successfully")
+        
+        # Overlap camera waits with inference
+        self._stop.clear()
+        self._grab_thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._grab_thread.start()
         return True
     
+    def _grab_loop(self):
+        """
+        Capture thread: keep only the newest camera frame in the queue
+        """
+        while not self._stop.is_set():
+            success, img = self.cap.read()
+            if not success:
+                self._stop.set()
+                break
+            
+            # Drop the stale frame if inference hasn't taken it yet
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            self._frames.put(img)
+    
     def draw_trail(self, img, center):
         """
         Draw movement trail
@@ -50,23 +110,60 @@ class HandTrackingApp:
             center: Current hand center position
         """
         if center:
-            self.trail_points.append(center)
+            # Store the new point at the ring head
+            self._trail[self._trail_head] = center
+            self._trail_head = (self._trail_head + 1) % self.max_trail_length
+            self._trail_len = min(self._trail_len + 1, self.max_trail_length)
             
-            # Limit trail length
-            if len(self.trail_points) > self.max_trail_length:
-                self.trail_points.pop(0)
-            
-            # Draw trail with fading effect
-            for i in range(1, len(self.trail_points)):
-                if self.trail_points[i - 1] is None or self.trail_points[i] is None:
-                    continue
-                
-                # Calculate thickness and color based on position in trail
-                thickness = int(np.sqrt(self.max_trail_length / float(i + 1)) * 3)
-                alpha = i / len(self.trail_points)
-                color = (int(255 * alpha), int(100 * alpha), int(255 * (1 - alpha)))
-                
-                cv2.line(img, self.trail_points[i - 1], self.trail_points[i], color, thickness)
+            # Draw trail with fading effect, oldest point first: segments
+            # 1..n-1 are split into runs, each one polyline styled like
+            # its middle segment
+            n = self._trail_len
+            if n > 1:
+                points = self.ordered_trail()
+                colors = self._trail_colors[n]
+                bounds = np.linspace(1, n, min(self.trail_groups, n - 1) + 1).astype(int).tolist()
+                for start, end in zip(bounds[:-1], bounds[1:]):
+                    # Thickness and color based on position in trail
+                    mid = (start + end - 1) // 2
+                    cv2.polylines(img, [points[start - 1:end]], False, colors[mid], self._trail_thickness[mid])
+    
+    def ordered_trail(self):
+        """
+        Get the stored trail points in order
+        
+        Returns:
+            int32 (n, 2) array of trail points, oldest first
+        """
+        if self._trail_len < self.max_trail_length:
+            return self._trail[:self._trail_len]
+        return np.roll(self._trail, -self._trail_head, axis=0)
+    
+    def clear_trail(self):
+        """Clear trail points"""
+        self._trail_len = 0
+        self._trail_head = 0
+    
+    def _build_instructions_layer(self):
+        """
+        Render the control instructions onto a black layer
+        
+        Returns:
+            BGR image placed 165 px above the bottom-left corner of the frame
+        """
+        instructions = [
+            "Controls:",
+            "Q - Quit",
+            "T - Toggle Tracking Lock",
+            "C - Clear Trail",
+            "R - Reset"
+        ]
+        
+        layer = np.zeros((130, 240, 3), np.uint8)
+        for i, instruction in enumerate(instructions):
+            cv2.putText(layer, instruction, (10, 15 + i * 25), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        return layer
     
     def draw_info(self, img, fps, hand_info):
         """
@@ -82,15 +179,15 @@ class HandTrackingApp:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
         # Draw hand detection status
-        status = "Hand Detected" if hand_info['detected'] else "No Hand Detected"
-        color = (0, 255, 0) if hand_info['detected'] else (0, 0, 255)
+        status = "Hand Detected" if hand_info.detected else "No Hand Detected"
+        color = (0, 255, 0) if hand_info.detected else (0, 0, 255)
         cv2.putText(img, status, (10, 60), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
         
         # Draw finger count
-        if hand_info['detected']:
-            fingers = hand_info['fingers_up']
-            finger_count = fingers.count(1)
+        if hand_info.detected:
+            fingers = hand_info.fingers_up
+            finger_count = int(fingers.sum())
             cv2.putText(img, f'Fingers Up: {finger_count}', (10, 90), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
             
@@ -100,19 +197,15 @@ class HandTrackingApp:
             cv2.putText(img, tracking_text, (10, 120), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, tracking_color, 2)
         
-        # Draw instructions
-        instructions = [
-            "Controls:",
-            "Q - Quit",
-            "T - Toggle Tracking Lock",
-            "C - Clear Trail",
-            "R - Reset"
-        ]
-        
-        y_offset = img.shape[0] - 150
-        for i, instruction in enumerate(instructions):
-            cv2.putText(img, instruction, (10, y_offset + i * 25), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        # Draw instructions (same baselines as img.shape[0] - 150 + i * 25)
+        # clipped to the frame like putText would
+        top = img.shape[0] - 165
+        layer = self._instr_img[max(0, -top):]
+        top = max(0, top)
+        roi = img[top:top + layer.shape[0], :layer.shape[1]]
+        layer = layer[:roi.shape[0], :roi.shape[1]]
+        if layer.size:
+            cv2.add(roi, layer, dst=roi)
     
     def draw_hand_bbox(self, img, landmarks):
         """
@@ -120,21 +213,15 @@ class HandTrackingApp:
         
         Args:
             img: Image to draw on
-            landmarks: List of hand landmarks
+            landmarks: (21, 2) array of [x, y] landmark positions
         """
         if len(landmarks) > 0:
-            x_coords = [lm[1] for lm in landmarks]
-            y_coords = [lm[2] for lm in landmarks]
-            
-            x_min, x_max = min(x_coords), max(x_coords)
-            y_min, y_max = min(y_coords), max(y_coords)
+            h, w = img.shape[:2]
             
-            # Add padding
+            # Padded extents, clipped to the image
             padding = 20
-            x_min = max(0, x_min - padding)
-            y_min = max(0, y_min - padding)
-            x_max = min(img.shape[1], x_max + padding)
-            y_max = min(img.shape[0], y_max + padding)
+            box = np.concatenate((landmarks.min(axis=0) - padding, landmarks.max(axis=0) + padding))
+            x_min, y_min, x_max, y_max = np.clip(box, 0, (w, h, w, h)).tolist()
             
             # Draw bounding box
             color = (0, 255, 255) if self.tracking_active else (255, 0, 0)
@@ -153,6 +240,9 @@ class HandTrackingApp:
             return
         
         print("\n=== Hand Gesture Tracking Started ===")
+        print(f"Backend: {self.detector.backend}")
+        if self.detector.backend_error:
+            print(f"HandLandmarker unavailable ({self.detector.backend_error})")
         print("Controls:")
         print("  Q - Quit application")
         print("  T - Toggle tracking lock on/off")
@@ -160,53 +250,58 @@ class HandTrackingApp:
         print("  R - Reset tracking")
         print("=====================================\n")
         
-        prev_time = 0
+        self._fps = 0.0
+        self._prev_t = time.perf_counter()
         
         try:
             while True:
-                success, img = self.cap.read()
-                
-                if not success:
-                    print("Error: Failed to read frame from camera")
-                    break
+                try:
+                    img = self._frames.get(timeout=0.1)
+                except queue.Empty:
+                    if self._stop.is_set():
+                        print("Error: Failed to read frame from camera")
+                        break
+                    continue
                 
-                # Flip image for mirror effect
-                img = cv2.flip(img, 1)
+                # Flip image for mirror effect into the reused buffer
+                if self._flip_buf is None or self._flip_buf.shape != img.shape:
+                    self._flip_buf = np.empty_like(img)
+                img = cv2.flip(img, 1, dst=self._flip_buf)
                 
                 # Find hands in the frame
-                img = self.detector.find_hands(img, draw=True)
-                landmarks = self.detector.find_position(img, draw=True)
-                hand_info = self.detector.get_hand_info()
+                hand_info = self.detector.process_frame(img, draw_landmarks=True, draw_tips=True)
                 
                 # Auto-lock tracking when hand is detected
-                if hand_info['detected'] and not self.tracking_active:
+                if hand_info.detected and not self.tracking_active:
                     self.tracking_active = True
                     print("Hand detected - Tracking locked!")
                 
                 # Draw bounding box around hand
-                if hand_info['detected']:
-                    self.draw_hand_bbox(img, landmarks)
+                if hand_info.detected:
+                    self.draw_hand_bbox(img, self.detector.landmark_array)
                 
                 # Draw movement trail from hand center
-                center = hand_info['center']
+                center = hand_info.center
                 if center and self.tracking_active:
                     self.draw_trail(img, center)
                     # Draw center point
                     cv2.circle(img, center, 10, (0, 255, 255), cv2.FILLED)
                 
                 # Calculate FPS
-                current_time = time.time()
-                fps = 1 / (current_time - prev_time) if prev_time != 0 else 0
-                prev_time = current_time
+                now = time.perf_counter()
+                instant_fps = 1.0 / (now - self._prev_t + 1e-6)
+                self._prev_t = now
+                self._fps = 0.9 * self._fps + 0.1 * instant_fps if self._fps else instant_fps
                 
                 # Draw information overlay
-                self.draw_info(img, fps, hand_info)
+                self.draw_info(img, self._fps, hand_info)
                 
                 # Display the image
                 cv2.imshow("Hand Gesture Tracking", img)
                 
-                # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
+                # Handle keyboard input (pollKey pumps GUI events without
+                # waitKey's minimum 1 ms sleep)
+                key = cv2.pollKey() & 0xFF
                 
                 if key == ord('q') or key == ord('Q'):
                     print("Quitting application...")
@@ -216,12 +311,12 @@ class HandTrackingApp:
                     status = "enabled" if self.tracking_active else "disabled"
                     print(f"Tracking lock {status}")
                     if not self.tracking_active:
-                        self.trail_points.clear()
+                        self.clear_trail()
                 elif key == ord('c') or key == ord('C'):
-                    self.trail_points.clear()
+                    self.clear_trail()
                     print("Trail cleared")
                 elif key == ord('r') or key == ord('R'):
-                    self.trail_points.clear()
+                    self.clear_trail()
                     self.tracking_active = False
                     print("Tracking reset")
         
@@ -233,8 +328,12 @@ class HandTrackingApp:
     
     def cleanup(self):
         """Clean up resources"""
+        self._stop.set()
+        if self._grab_thread:
+            self._grab_thread.join(timeout=1.0)
         if self.cap:
             self.cap.release()
+        self.detector.close()
         cv2.destroyAllWindows()
         print("Application closed successfully")
 
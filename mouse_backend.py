@@ -0,0 +1,199 @@
+"""
+Native Mouse Backend
+Binds cursor movement and clicks directly to the OS API once at startup,
+avoiding PyAutoGUI's per-call dispatch in the per-frame hot loop
+"""
+import sys
+import ctypes
+import pyautogui
+
+
+class PyAutoGUIBackend:
+    """
+    Fallback backend that forwards every call to PyAutoGUI
+    """
+    
+    name = "pyautogui"
+    
+    def position(self):
+        """Return current cursor position as (x, y)"""
+        return tuple(pyautogui.position())
+    
+    def move(self, x, y):
+        """Move cursor to (x, y)"""
+        pyautogui.moveTo(x, y)
+    
+    def click(self):
+        """Left click at current position"""
+        pyautogui.click()
+    
+    def double_click(self):
+        """Left double click at current position"""
+        pyautogui.doubleClick()
+    
+    def mouse_down(self):
+        """Press left button"""
+        pyautogui.mouseDown()
+    
+    def mouse_up(self):
+        """Release left button"""
+        pyautogui.mouseUp()
+
+
+class WindowsBackend(PyAutoGUIBackend):
+    """
+    Windows backend using user32 SetCursorPos / mouse_event
+    """
+    
+    name = "win32"
+    
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+    
+    def __init__(self):
+        from ctypes import wintypes
+        
+        user32 = ctypes.windll.user32
+        self._set_cursor_pos = user32.SetCursorPos
+        self._get_cursor_pos = user32.GetCursorPos
+        self._mouse_event = user32.mouse_event
+        self._point = wintypes.POINT()
+        self._point_ref = ctypes.byref(self._point)
+    
+    def position(self):
+        self._get_cursor_pos(self._point_ref)
+        return self._point.x, self._point.y
+    
+    def move(self, x, y):
+        self._set_cursor_pos(x, y)
+    
+    def click(self):
+        self._mouse_event(self.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+        self._mouse_event(self.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+    
+    def double_click(self):
+        self.click()
+        self.click()
+    
+    def mouse_down(self):
+        self._mouse_event(self.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+    
+    def mouse_up(self):
+        self._mouse_event(self.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+
+
+class MacBackend(PyAutoGUIBackend):
+    """
+    macOS backend posting Quartz CGEvents directly
+    """
+    
+    name = "quartz"
+    
+    def __init__(self):
+        import Quartz
+        
+        self._q = Quartz
+        self._button_down = False
+    
+    def _post(self, event_type, x, y, click_state=1):
+        q = self._q
+        event = q.CGEventCreateMouseEvent(None, event_type, (x, y), q.kCGMouseButtonLeft)
+        q.CGEventSetIntegerValueField(event, q.kCGMouseEventClickState, click_state)
+        q.CGEventPost(q.kCGHIDEventTap, event)
+    
+    def position(self):
+        loc = self._q.CGEventGetLocation(self._q.CGEventCreate(None))
+        return int(loc.x), int(loc.y)
+    
+    def move(self, x, y):
+        # Dragged events are required while the button is held, otherwise
+        # the target application never sees the drag
+        if self._button_down:
+            self._post(self._q.kCGEventLeftMouseDragged, x, y)
+        else:
+            self._post(self._q.kCGEventMouseMoved, x, y)
+    
+    def click(self):
+        x, y = self.position()
+        self._post(self._q.kCGEventLeftMouseDown, x, y)
+        self._post(self._q.kCGEventLeftMouseUp, x, y)
+    
+    def double_click(self):
+        x, y = self.position()
+        self._post(self._q.kCGEventLeftMouseDown, x, y)
+        self._post(self._q.kCGEventLeftMouseUp, x, y)
+        self._post(self._q.kCGEventLeftMouseDown, x, y, click_state=2)
+        self._post(self._q.kCGEventLeftMouseUp, x, y, click_state=2)
+    
+    def mouse_down(self):
+        x, y = self.position()
+        self._post(self._q.kCGEventLeftMouseDown, x, y)
+        self._button_down = True
+    
+    def mouse_up(self):
+        x, y = self.position()
+        self._post(self._q.kCGEventLeftMouseUp, x, y)
+        self._button_down = False
+
+
+class X11Backend(PyAutoGUIBackend):
+    """
+    X11 backend using python-xlib warp_pointer and the XTEST extension
+    """
+    
+    name = "x11"
+    
+    def __init__(self):
+        from Xlib import X
+        from Xlib.display import Display
+        from Xlib.ext import xtest
+        
+        self._X = X
+        self._xtest = xtest
+        self._display = Display()
+        self._root = self._display.screen().root
+    
+    def position(self):
+        pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+    
+    def move(self, x, y):
+        self._root.warp_pointer(x, y)
+        self._display.flush()
+    
+    def _button(self, event_type):
+        self._xtest.fake_input(self._display, event_type, 1)
+        self._display.sync()
+    
+    def click(self):
+        self._button(self._X.ButtonPress)
+        self._button(self._X.ButtonRelease)
+    
+    def double_click(self):
+        self.click()
+        self.click()
+    
+    def mouse_down(self):
+        self._button(self._X.ButtonPress)
+    
+    def mouse_up(self):
+        self._button(self._X.ButtonRelease)
+
+
+def create_backend():
+    """
+    Resolve the fastest available mouse backend for this platform
+    
+    Returns:
+        Backend instance (falls back to PyAutoGUI if the native API is unavailable)
+    """
+    try:
+        if sys.platform == "win32":
+            return WindowsBackend()
+        if sys.platform == "darwin":
+            return MacBackend()
+        if sys.platform.startswith("linux"):
+            return X11Backend()
+    except Exception as e:
+        print(f"Native mouse backend unavailable ({e}), using PyAutoGUI")
+    return PyAutoGUIBackend()
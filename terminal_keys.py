@@ -0,0 +1,66 @@
+"""
+Terminal Key Polling
+Non-blocking single-key reads from the console (msvcrt on Windows,
+termios + select on POSIX) so the main loop never waits on keyboard input
+"""
+import sys
+import select
+
+
+class TerminalKeys:
+    """
+    Poll the controlling terminal for key presses without blocking
+    """
+    
+    def __init__(self):
+        """Initialize poller (inactive until start() is called)"""
+        self.enabled = False
+        self._saved_attrs = None
+    
+    def start(self):
+        """
+        Switch the terminal to unbuffered (cbreak) input
+        
+        Does nothing when stdin is not an interactive terminal
+        """
+        if not sys.stdin.isatty():
+            return
+        
+        if sys.platform == "win32":
+            import msvcrt
+            self._msvcrt = msvcrt
+        else:
+            import termios
+            import tty
+            fd = sys.stdin.fileno()
+            self._saved_attrs = termios.tcgetattr(fd)
+            tty.setcbreak(fd)  # Ctrl+C still raises KeyboardInterrupt
+        self.enabled = True
+    
+    def read(self):
+        """
+        Read one pending key press
+        
+        Returns:
+            The key as a string, or None if no key is waiting
+        """
+        if not self.enabled:
+            return None
+        
+        if sys.platform == "win32":
+            if self._msvcrt.kbhit():
+                return self._msvcrt.getwch()
+            return None
+        
+        ready, _, _ = select.select([sys.stdin], [], [], 0)
+        if ready:
+            return sys.stdin.read(1)
+        return None
+    
+    def stop(self):
+        """Restore the terminal's original input mode"""
+        if self._saved_attrs is not None:
+            import termios
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved_attrs)
+            self._saved_attrs = None
+        self.enabled = False